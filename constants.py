@@ -1,17 +1,22 @@
 """Holds all constants.
 """
 import numpy as np
-from fairlearn.metrics import demographic_parity_difference, equalized_odds_difference, true_positive_rate, false_positive_rate
 from fairlearn.reductions import DemographicParity, EqualizedOdds, FalsePositiveRateParity, TruePositiveRateParity
+from fairness_metrics import demographic_parity_difference, equalized_odds_difference, true_positive_rate_difference, false_positive_rate_difference
 
 # ML Models
-MAX_ITER: int = 10000
-N_JOBS: int = -1
+SOLVER: str = 'lbfgs'
+MAX_ITER: int = 200
+TOLERANCE: float = 1e-3
+N_JOBS: int = 1
+WORKER_THREADS: int = 1
 DIFFERENCE_BOUND: float = 0.01
+DIRECT_DEMOGRAPHIC_PARITY: bool = True
+CONSTRAINED_MAX_ITER: int = 10000
+CONSTRAINED_TIGHTENING_STEPS: int = 5
 
 # Analyzer
 TRIAL_COUNT_DEFAULT: int = 10
-TRIAL_MAX_ATTEMPTS: int = 5
 LABEL_BIAS_RANGE_MIN: float = 0.0
 LABEL_BIAS_RANGE_MAX: float = 0.5
 LABEL_BIAS_RANGE_INTERVAL: float = 0.1
@@ -134,8 +139,8 @@ COL_FALSE_POS_RATE: str = 'False Positive Rate'
 
 CONSTRAINED_MODELS = {DemographicParity: (demographic_parity_difference, COL_DP_DIFFERENCE),
                       EqualizedOdds: (equalized_odds_difference, COL_EO_DIFFERENCE),
-                      TruePositiveRateParity: (true_positive_rate, COL_TRUE_POS_RATE),
-                      FalsePositiveRateParity: (false_positive_rate, COL_FALSE_POS_RATE)}
+                      TruePositiveRateParity: (true_positive_rate_difference, COL_TRUE_POS_RATE),
+                      FalsePositiveRateParity: (false_positive_rate_difference, COL_FALSE_POS_RATE)}
 MODEL_LINES = {'Unconstrained': 'tab:red',
                'Demographic Parity': 'tab:blue',
                'Equalized Odds': 'tab:green',
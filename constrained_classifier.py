@@ -0,0 +1,250 @@
+"""Classifiers trained directly under fairness constraints, as a faster alternative to fairlearn's reductions.
+
+Classes
+-------
+DemographicParityClassifier
+    Logistic regression fit under a demographic parity constraint, with its predicted labels on the training data within the difference bound.
+
+Methods
+-------
+logistic_loss(weights: numpy.ndarray, data: numpy.ndarray, labels: numpy.ndarray, regularization: float) -> Tuple[float, numpy.ndarray]
+    Computes the regularized mean logistic loss and its gradient.
+parity_constraint(weights: numpy.ndarray, data: numpy.ndarray, group_weights: numpy.ndarray, difference_bound: float) -> numpy.ndarray
+    Computes the demographic parity constraints.
+parity_constraint_jacobian(weights: numpy.ndarray, data: numpy.ndarray, group_weights: numpy.ndarray, difference_bound: float) -> numpy.ndarray
+    Computes the jacobian of the demographic parity constraints.
+best_threshold(decisions: numpy.ndarray, labels: numpy.ndarray, group_weights: numpy.ndarray, difference_bound: float) -> Optional[Tuple[float, float]]
+    Finds the most accurate decision threshold whose predicted labels meet the demographic parity constraint.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+
+import constants as const
+
+
+class DemographicParityClassifier:
+    """Logistic regression fit under a demographic parity constraint, with its predicted labels on the training data within the difference bound.
+
+    Follows the fit / predict interface of fairlearn.reductions.ExponentiatedGradient, so it can be used in its place.
+    The constraint bounds the mean predicted probability of each group, which does not bound the predicted labels.
+    The constrained problem is solved for successively halved bounds, each solution is given the most accurate decision threshold whose predicted labels on the training data meet the difference bound, and the most accurate of these is kept.
+
+    Attributes
+    ----------
+    estimator: LogisticRegression
+        Unconstrained estimator. Its regularization strength is reused, and its coefficients are used as the starting point if it has been fit.
+    difference_bound: float
+        Maximum difference allowed between the selection rate of any group and the overall selection rate.
+    coef_: numpy.ndarray
+        Coefficients of the features in the decision function. Only set after fitting.
+    intercept_: float
+        Intercept of the decision function. Only set after fitting.
+
+    Methods
+    -------
+    fit(X: numpy.ndarray, y: numpy.ndarray, sensitive_features: numpy.ndarray) -> DemographicParityClassifier
+        Fits the constrained logistic regression.
+    predict(X: numpy.ndarray) -> numpy.ndarray
+        Predicts the labels of the given data.
+    """
+
+    def __init__(self, estimator: LogisticRegression, difference_bound: float = const.DIFFERENCE_BOUND) -> None:
+        """
+        Parameters
+        ----------
+        estimator: LogisticRegression
+            Unconstrained estimator. Its regularization strength is reused, and its coefficients are used as the starting point if it has been fit.
+        difference_bound: float
+            Maximum difference allowed between the selection rate of any group and the overall selection rate.
+        """
+
+        self.estimator: LogisticRegression = estimator
+        self.difference_bound: float = difference_bound
+
+    def fit(self, X: np.ndarray, y: np.ndarray, sensitive_features: np.ndarray) -> 'DemographicParityClassifier':
+        """Fits the constrained logistic regression.
+
+        Parameters
+        ----------
+        X: numpy.ndarray
+            The training data.
+        y: numpy.ndarray
+            The labels of the training data, encoded as 0 and 1.
+        sensitive_features: numpy.ndarray
+            The sensitive attribute of each row of the training data.
+
+        Returns
+        -------
+        DemographicParityClassifier
+            The fitted classifier.
+
+        Raises
+        ------
+        ValueError
+            If no solution found by the optimizer has a decision threshold whose predicted labels on the training data meet the difference bound.
+        """
+
+        data: np.ndarray = np.hstack([np.asarray(X, dtype=np.float64), np.ones((len(X), 1))])
+        labels: np.ndarray = np.asarray(y, dtype=np.float64)
+        groups: np.ndarray = np.unique(np.asarray(sensitive_features), return_inverse=True)[1]
+        group_weights: np.ndarray = np.equal.outer(np.arange(groups.max() + 1), groups) / np.bincount(groups)[:, None]
+        regularization: float = 1 / (self.estimator.C * len(labels))
+
+        weights: np.ndarray = np.zeros(data.shape[1])
+        if hasattr(self.estimator, 'coef_'):
+            weights = np.append(self.estimator.coef_.ravel(), self.estimator.intercept_)
+
+        best_accuracy: float = -1.0
+        for step in range(const.CONSTRAINED_TIGHTENING_STEPS):
+            result = minimize(logistic_loss,
+                              weights,
+                              args=(data, labels, regularization),
+                              jac=True,
+                              method='SLSQP',
+                              constraints=[{'type': 'ineq', 'fun': parity_constraint, 'jac': parity_constraint_jacobian, 'args': (data, group_weights, self.difference_bound / 2 ** step)}],
+                              options={'maxiter': const.CONSTRAINED_MAX_ITER})
+            if not result.success:
+                break
+            weights = result.x
+            threshold = best_threshold(data @ weights, labels, group_weights, self.difference_bound)
+            if threshold is not None and threshold[1] > best_accuracy:
+                best_accuracy = threshold[1]
+                self.coef_: np.ndarray = weights[:-1]
+                self.intercept_: float = weights[-1] - threshold[0]
+        if best_accuracy < 0:
+            raise ValueError('No decision threshold keeps the predicted labels on the training data within the difference bound.')
+
+        predictions: np.ndarray = self.predict(X)
+        if np.abs(group_weights @ predictions - predictions.mean()).max() > self.difference_bound:
+            raise ValueError('Predicted labels on the training data exceed the difference bound.')
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicts the labels of the given data.
+
+        Parameters
+        ----------
+        X: numpy.ndarray
+            The data to predict labels for.
+
+        Returns
+        -------
+        numpy.ndarray
+            The predicted labels, encoded as 0 and 1.
+        """
+
+        return (np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_ > 0).astype(int)
+
+
+def logistic_loss(weights: np.ndarray, data: np.ndarray, labels: np.ndarray, regularization: float) -> Tuple[float, np.ndarray]:
+    """Computes the regularized mean logistic loss and its gradient. The intercept, the last weight, is not regularized.
+
+    Parameters
+    ----------
+    weights: numpy.ndarray
+        Weights of the decision function, with the intercept last.
+    data: numpy.ndarray
+        The training data, with a trailing column of ones.
+    labels: numpy.ndarray
+        The labels of the training data, encoded as 0 and 1.
+    regularization: float
+        Strength of the L2 penalty on the weights.
+
+    Returns
+    -------
+    Tuple[float, numpy.ndarray]
+        The loss and its gradient with respect to the weights.
+    """
+
+    decisions: np.ndarray = data @ weights
+    loss: float = np.mean(np.logaddexp(0, decisions) - labels * decisions) + 0.5 * regularization * (weights[:-1] @ weights[:-1])
+    gradient: np.ndarray = (expit(decisions) - labels) @ data / len(labels)
+    gradient[:-1] += regularization * weights[:-1]
+    return loss, gradient
+
+def parity_constraint(weights: np.ndarray, data: np.ndarray, group_weights: np.ndarray, difference_bound: float) -> np.ndarray:
+    """Computes the demographic parity constraints, which are satisfied when every value is non-negative.
+
+    Parameters
+    ----------
+    weights: numpy.ndarray
+        Weights of the decision function, with the intercept last.
+    data: numpy.ndarray
+        The training data, with a trailing column of ones.
+    group_weights: numpy.ndarray
+        One row per group, averaging over the rows of the training data in that group.
+    difference_bound: float
+        Maximum difference allowed between the mean predicted probability of any group and the overall mean predicted probability.
+
+    Returns
+    -------
+    numpy.ndarray
+        The upper bound constraints of each group, followed by the lower bound constraints of each group.
+    """
+
+    probabilities: np.ndarray = expit(data @ weights)
+    differences: np.ndarray = group_weights @ probabilities - probabilities.mean()
+    return np.concatenate([difference_bound - differences, difference_bound + differences])
+
+def parity_constraint_jacobian(weights: np.ndarray, data: np.ndarray, group_weights: np.ndarray, difference_bound: float) -> np.ndarray:
+    """Computes the jacobian of the demographic parity constraints with respect to the weights.
+
+    Parameters
+    ----------
+    weights: numpy.ndarray
+        Weights of the decision function, with the intercept last.
+    data: numpy.ndarray
+        The training data, with a trailing column of ones.
+    group_weights: numpy.ndarray
+        One row per group, averaging over the rows of the training data in that group.
+    difference_bound: float
+        Unused, accepted so the constraint and its jacobian take the same arguments.
+
+    Returns
+    -------
+    numpy.ndarray
+        The jacobian, with one row per constraint in the order returned by parity_constraint.
+    """
+
+    probabilities: np.ndarray = expit(data @ weights)
+    probability_gradients: np.ndarray = (probabilities * (1 - probabilities))[:, None] * data
+    difference_gradients: np.ndarray = group_weights @ probability_gradients - probability_gradients.mean(axis=0)
+    return np.vstack([-difference_gradients, difference_gradients])
+
+def best_threshold(decisions: np.ndarray, labels: np.ndarray, group_weights: np.ndarray, difference_bound: float) -> Optional[Tuple[float, float]]:
+    """Finds the most accurate decision threshold whose predicted labels meet the demographic parity constraint.
+
+    Only thresholds between two distinct decision values are considered, and at least one row is predicted on each side of the threshold.
+
+    Parameters
+    ----------
+    decisions: numpy.ndarray
+        The value of the decision function for each row of the training data.
+    labels: numpy.ndarray
+        The labels of the training data, encoded as 0 and 1.
+    group_weights: numpy.ndarray
+        One row per group, averaging over the rows of the training data in that group.
+    difference_bound: float
+        Maximum difference allowed between the selection rate of any group and the overall selection rate.
+
+    Returns
+    -------
+    Optional[Tuple[float, float]]
+        The threshold and the accuracy of the predicted labels on the training data, or None if no threshold meets the constraint.
+    """
+
+    order: np.ndarray = np.argsort(-decisions)
+    decisions, labels = decisions[order], labels[order]
+    selection_rates: np.ndarray = np.cumsum(group_weights[:, order], axis=1)[:, :-1]
+    differences: np.ndarray = np.abs(selection_rates - np.arange(1, len(decisions)) / len(decisions)).max(axis=0)
+    accuracies: np.ndarray = (np.cumsum(labels) + (len(labels) - labels.sum()) - np.cumsum(1 - labels))[:-1] / len(labels)
+    candidates: np.ndarray = np.flatnonzero((decisions[:-1] > decisions[1:]) & (differences <= difference_bound))
+    if len(candidates) == 0:
+        return None
+    best: int = candidates[np.argmax(accuracies[candidates])]
+    return (decisions[best] + decisions[best + 1]) / 2, accuracies[best]
@@ -5,17 +5,24 @@ Classes
 DataReader
     Reads data from training and test data sets and encodes them. Data in the training set can be manipulated to introduce bias before returning.
 
-Objects
+Methods
 -------
-Adult
+Adult() -> DataReader
     The Adult dataset (https://archive.ics.uci.edu/ml/datasets/adult)
-Debug
+SmallAdultEven() -> DataReader
+    Small subset of the Adult dataset.
+SmallAdultProp() -> DataReader
+    Small subset of the Adult dataset.
+Debug() -> DataReader
     Simple dataset meant for debugging.
+
+Each of these creates its DataReader on the first call and returns the same one afterwards, so importing this module does not touch the data files.
 """
 
+from functools import lru_cache
 from math import isclose
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from sklearn import preprocessing
 
@@ -103,6 +110,11 @@ class DataReader:
         self.sensitive_attributes: Dict[str, str] = sensitive_attributes
         self.label_unqualified_qualified = label_unqualified_qualified
         
+        self.__file_cache: Dict[bool, Tuple[pd.DataFrame, pd.Series, pd.DataFrame]] = {}
+        self.__encoded_cache: Dict[bool, Tuple[pd.DataFrame, pd.Series, pd.DataFrame]] = {}
+        self.__sensitive_attribute_values: Dict[bool, Dict[str, List[str]]] = {}
+        self.__encoder_categories: Optional[Dict[str, pd.Index]] = None
+        
     def training_data(self) -> Tuple[pd.DataFrame, pd.Series]:
         """Gets and encodes the training data and the label column.
         
@@ -117,7 +129,7 @@ class DataReader:
     def training_data_label_bias(self,
                                  flip_rate: Tuple[str, str, float, float],
                                  confidence_threshold: float = 1,
-                                 initial_model: LogisticRegression = LogisticRegression(max_iter=const.MAX_ITER, n_jobs=const.N_JOBS)) -> Tuple[pd.DataFrame, pd.Series]:
+                                 initial_model: LogisticRegression = LogisticRegression(solver=const.SOLVER, max_iter=const.MAX_ITER, tol=const.TOLERANCE, n_jobs=const.N_JOBS)) -> Tuple[pd.DataFrame, pd.Series]:
         if not -1 <= confidence_threshold <= 1 and not isclose(confidence_threshold, -1) and not isclose(confidence_threshold, 1):
             raise ValueError('Threshold must be between -1 and 1, inclusive.')
         if not any(0 <= rate <= 1 or isclose(rate, 0) or isclose(rate, 1) for rate in flip_rate[2:]):
@@ -170,15 +182,15 @@ class DataReader:
     def sensitive_attribute_vals(self, sensitive_attribute_column: str) -> List[str]:
         if sensitive_attribute_column not in self.sensitive_attributes:
             raise ValueError(f'{sensitive_attribute_column} is not a sensitive attribute.')
-        if not hasattr(self, '__sensitive_attribute_values'):
+        if True not in self.__sensitive_attribute_values:
             self.__read_file(True)
-        return self.__sensitive_attribute_values[sensitive_attribute_column]
+        return self.__sensitive_attribute_values[True][sensitive_attribute_column]
     
     def directory(self) -> str:
         return self.__training_path.parent.name
     
     def __read_file(self, is_test: bool) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame]:
-        """Reads the data file at the location of either the training data or test data.
+        """Reads the data file at the location of either the training data or test data. The file is only parsed once; later calls return copies of the cached result.
         
         Parameters
         ----------
@@ -195,30 +207,39 @@ class DataReader:
         IOError
             If the file being read cannot be found.
         """
+        if is_test not in self.__file_cache:
+            self.__file_cache[is_test] = self.__parse_file(is_test)
+        df, labels, sensitive_attributes = self.__file_cache[is_test]
+        return df.copy(), labels.copy(), sensitive_attributes.copy()
+    
+    def __parse_file(self, is_test: bool) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame]:
         try:
             df = pd.read_csv((self.__test_path if is_test else self.__training_path), 
                             names = self.__features, 
                             dtype = self.__types, 
-                            sep=r'\s*,\s*', 
-                            engine='python', 
+                            sep=',', 
+                            skipinitialspace=True, 
+                            engine='c', 
                             keep_default_na=False,
                             skiprows = self.__test_data_line_skip if is_test else self.__training_data_line_skip)
         except IOError as _:
             raise IOError(f'{"Test" if is_test else "Training"} file not found at the location specified')
         
-        self.__sensitive_attribute_values = {}
+        sensitive_attribute_values: Dict[str, List[str]] = {}
         for sensitive_attribute_column, advantaged_value in self.sensitive_attributes.items():
             col_unique_values = df[sensitive_attribute_column].unique()
             if len(col_unique_values) > 2:
                 df.loc[df[sensitive_attribute_column] != advantaged_value, sensitive_attribute_column] = f'Non-{advantaged_value}'
-                self.__sensitive_attribute_values[sensitive_attribute_column] = [advantaged_value, f'Non-{advantaged_value}']
+                sensitive_attribute_values[sensitive_attribute_column] = [advantaged_value, f'Non-{advantaged_value}']
             else:
-                self.__sensitive_attribute_values[sensitive_attribute_column] = col_unique_values
+                sensitive_attribute_values[sensitive_attribute_column] = col_unique_values
+        self.__sensitive_attribute_values[is_test] = sensitive_attribute_values
                 
         labels = df[self.label_column_name]
         df = df.loc[:, df.columns != self.label_column_name]
         
-        labels = labels.map(lambda label: label.strip(' .') if isinstance(label, str) else label)
+        if pd.api.types.is_string_dtype(labels):
+            labels = labels.str.strip(' .')
         
         if len(self.label_unqualified_qualified) != 2:
             raise ValueError('Two values must be provided for qualified/unqualified labels.')
@@ -233,7 +254,8 @@ class DataReader:
         return df, pd.Series(labels), df[self.sensitive_attributes.keys()]
     
     def __encode_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Encodes all non-numerical columns in the given Dataframe. 
+        """Encodes all non-numerical columns in the given Dataframe, and stores every integer column in the smallest integer type that fits it.
+        Columns are encoded with the categories of the training data, so values are encoded the same way in the training and test data. Values not in the training data are encoded as -1.
         
         Parameters
         ----------
@@ -246,14 +268,29 @@ class DataReader:
             The encoded DataFrame.
         """
         
-        for colName in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[colName]):
-                encoder: LabelEncoder = LabelEncoder()
-                df[colName] = encoder.fit_transform(df[colName])
+        encoder_categories = self.__training_categories()
+        for colName in df.select_dtypes(exclude='number').columns:
+            df[colName] = pd.Categorical(df[colName], categories=encoder_categories[colName]).codes
+        for colName in df.select_dtypes(include='integer').columns:
+            df[colName] = pd.to_numeric(df[colName], downcast='integer')
         return df
     
+    def __training_categories(self) -> Dict[str, pd.Index]:
+        """Gets the categories of every non-numerical column in the training data, which are used to encode both the training and test data.
+        
+        Returns
+        -------
+        Dict[str, pandas.Index]
+            The sorted categories of each non-numerical column.
+        """
+        
+        if self.__encoder_categories is None:
+            data, _, _ = self.__read_file(is_test = False)
+            self.__encoder_categories = {colName: data[colName].astype('category').cat.categories for colName in data.select_dtypes(exclude='number').columns}
+        return self.__encoder_categories
+    
     def __read_encoded_dataframe(self, is_test: bool) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame]:
-        """Gets the training or test data, and encodes all non-numeric columns.
+        """Gets the training or test data, and encodes all non-numeric columns. The encoded data is cached, so the returned objects are shared between calls and must not be modified.
         
         Parameters
         ----------
@@ -266,6 +303,9 @@ class DataReader:
             The encoded data, the encoded label column of the data, and the encoded sensitive attribute(s) of the data.
         """
         
+        if is_test in self.__encoded_cache:
+            return self.__encoded_cache[is_test]
+        
         data, labels, sensitive_attributes = self.__read_file(is_test = is_test)
         
         data = self.__encode_dataframe(data)
@@ -273,7 +313,8 @@ class DataReader:
         labels = self.__encode_dataframe(labels.to_frame()).squeeze()
         sensitive_attributes = self.__encode_dataframe(sensitive_attributes)
         
-        return data, labels, sensitive_attributes
+        self.__encoded_cache[is_test] = (data, labels, sensitive_attributes)
+        return self.__encoded_cache[is_test]
     
     def __data_transform(self, df):
         binary_data = pd.get_dummies(df)
@@ -281,8 +322,19 @@ class DataReader:
         scaler = preprocessing.StandardScaler()
         data = pd.DataFrame(scaler.fit_transform(feature_cols), columns=feature_cols.columns)
         return data
-        
-Adult = DataReader(*const.ADULT_PARAMS)
-SmallAdultEven = DataReader(*const.SMALLADULTEVEN_PARAMS)
-SmallAdultProp = DataReader(*const.SMALLADULTPROP_PARAMS)
-Debug = DataReader(*const.DEBUG_PARAMS)
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def Adult() -> DataReader:
+    return DataReader(*const.ADULT_PARAMS)
+
+@lru_cache(maxsize=1)
+def SmallAdultEven() -> DataReader:
+    return DataReader(*const.SMALLADULTEVEN_PARAMS)
+
+@lru_cache(maxsize=1)
+def SmallAdultProp() -> DataReader:
+    return DataReader(*const.SMALLADULTPROP_PARAMS)
+
+@lru_cache(maxsize=1)
+def Debug() -> DataReader:
+    return DataReader(*const.DEBUG_PARAMS)
@@ -0,0 +1,112 @@
+"""Computes fairness metrics of binary predictions between the groups of a sensitive attribute.
+
+Equivalent to the corresponding fairlearn metrics, but computed directly with numpy.bincount instead of through a grouped DataFrame.
+As in fairlearn, a group with no rows to compute a rate over, such as a group with no positive labels for the true positive rate, has a rate of 0.
+
+Methods
+-------
+demographic_parity_difference(y_true: numpy.ndarray, y_pred: numpy.ndarray, sensitive_features: numpy.ndarray) -> float
+    Gets the largest difference in selection rate between any two groups.
+equalized_odds_difference(y_true: numpy.ndarray, y_pred: numpy.ndarray, sensitive_features: numpy.ndarray) -> float
+    Gets the larger of the true positive rate difference and the false positive rate difference.
+true_positive_rate_difference(y_true: numpy.ndarray, y_pred: numpy.ndarray, sensitive_features: numpy.ndarray) -> float
+    Gets the largest difference in true positive rate between any two groups.
+false_positive_rate_difference(y_true: numpy.ndarray, y_pred: numpy.ndarray, sensitive_features: numpy.ndarray) -> float
+    Gets the largest difference in false positive rate between any two groups.
+"""
+
+import numpy as np
+
+
+def demographic_parity_difference(y_true: np.ndarray, y_pred: np.ndarray, sensitive_features: np.ndarray) -> float:
+    """Gets the largest difference in selection rate between any two groups.
+
+    Parameters
+    ----------
+    y_true: numpy.ndarray
+        The true labels, encoded as 0 and 1.
+    y_pred: numpy.ndarray
+        The predicted labels, encoded as 0 and 1.
+    sensitive_features: numpy.ndarray
+        The sensitive attribute of each row.
+
+    Returns
+    -------
+    float
+        The demographic parity difference.
+    """
+
+    y_pred = np.asarray(y_pred)
+    return __rate_difference(y_pred, __groups(sensitive_features), np.ones(len(y_pred), dtype=bool))
+
+def equalized_odds_difference(y_true: np.ndarray, y_pred: np.ndarray, sensitive_features: np.ndarray) -> float:
+    """Gets the larger of the true positive rate difference and the false positive rate difference.
+
+    Parameters
+    ----------
+    y_true: numpy.ndarray
+        The true labels, encoded as 0 and 1.
+    y_pred: numpy.ndarray
+        The predicted labels, encoded as 0 and 1.
+    sensitive_features: numpy.ndarray
+        The sensitive attribute of each row.
+
+    Returns
+    -------
+    float
+        The equalized odds difference.
+    """
+
+    groups: np.ndarray = __groups(sensitive_features)
+    y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+    return max(__rate_difference(y_pred, groups, y_true == 1), __rate_difference(y_pred, groups, y_true == 0))
+
+def true_positive_rate_difference(y_true: np.ndarray, y_pred: np.ndarray, sensitive_features: np.ndarray) -> float:
+    """Gets the largest difference in true positive rate between any two groups.
+
+    Parameters
+    ----------
+    y_true: numpy.ndarray
+        The true labels, encoded as 0 and 1.
+    y_pred: numpy.ndarray
+        The predicted labels, encoded as 0 and 1.
+    sensitive_features: numpy.ndarray
+        The sensitive attribute of each row.
+
+    Returns
+    -------
+    float
+        The true positive rate difference.
+    """
+
+    return __rate_difference(np.asarray(y_pred), __groups(sensitive_features), np.asarray(y_true) == 1)
+
+def false_positive_rate_difference(y_true: np.ndarray, y_pred: np.ndarray, sensitive_features: np.ndarray) -> float:
+    """Gets the largest difference in false positive rate between any two groups.
+
+    Parameters
+    ----------
+    y_true: numpy.ndarray
+        The true labels, encoded as 0 and 1.
+    y_pred: numpy.ndarray
+        The predicted labels, encoded as 0 and 1.
+    sensitive_features: numpy.ndarray
+        The sensitive attribute of each row.
+
+    Returns
+    -------
+    float
+        The false positive rate difference.
+    """
+
+    return __rate_difference(np.asarray(y_pred), __groups(sensitive_features), np.asarray(y_true) == 0)
+
+def __groups(sensitive_features: np.ndarray) -> np.ndarray:
+    return np.unique(np.asarray(sensitive_features), return_inverse=True)[1]
+
+def __rate_difference(y_pred: np.ndarray, groups: np.ndarray, mask: np.ndarray) -> float:
+    group_count: int = groups.max() + 1
+    counts: np.ndarray = np.bincount(groups[mask], minlength=group_count)
+    totals: np.ndarray = np.bincount(groups[mask], weights=y_pred[mask], minlength=group_count)
+    rates: np.ndarray = np.divide(totals, counts, out=np.zeros(group_count), where=counts > 0)
+    return rates.max() - rates.min()
@@ -1,5 +1,5 @@
 import dill
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import os
 from matplotlib.axes import Axes
 import pandas as pd
@@ -55,10 +55,9 @@ def read_models(data_reader: DataReader, tests: List[Tuple[Tuple[str, str, float
     
 # METRICS
 
-def generate_metrics_row(data_reader: DataReader, trial_num: int, flip_rate: Tuple[str, str, float, float], confidence_threshold: float, model_metrics: List[float]) -> pd.DataFrame:
+def generate_metrics_row(data_reader: DataReader, trial_num: int, flip_rate: Tuple[str, str, float, float], confidence_threshold: float, model_metrics: List[float]) -> Dict[str, float]:
     if len(model_metrics) != len(const.MODEL_LINES) + len(const.CONSTRAINED_MODELS):
         raise ValueError('model_metrics array must include an accuracy measurement for every model, and the appropriate metric for constrained models.')
-    df: pd.DataFrame = pd.DataFrame(columns=__generate_column_names(data_reader, flip_rate))
     values = [trial_num]
     for value in data_reader.sensitive_attribute_vals(flip_rate[0]):
         if flip_rate[1]:
@@ -73,8 +72,7 @@ def generate_metrics_row(data_reader: DataReader, trial_num: int, flip_rate: Tup
             values.append(flip_rate[3])
     values.append(confidence_threshold)
     values.extend(model_metrics)
-    df.loc[0] = values
-    return df
+    return dict(zip(__generate_column_names(data_reader, flip_rate), values))
 
 def save_metrics(data_reader: DataReader, tests: List[Tuple[Tuple[str, str, float, float], float]], metrics: pd.DataFrame):
     metrics.to_csv(__get_metrics_file_name(data_reader, tests, True))
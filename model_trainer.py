@@ -1,15 +1,20 @@
-from functools import partial
+import dill
 from multiprocessing import Pool
-from multiprocessing.pool import ThreadPool
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
 import constants as const
 import file_handler
 
-from fairlearn.reductions import ExponentiatedGradient
+from fairlearn.reductions import DemographicParity, ExponentiatedGradient
 from sklearn.linear_model import LogisticRegression
+from threadpoolctl import threadpool_limits
+from tqdm import tqdm
+from constrained_classifier import DemographicParityClassifier
 from data_reader import DataReader
 
+__worker_state: dict = {}
+
 def label_bias_train(data_reader: DataReader,
                      tests: List[Tuple[Tuple[str, str, float, float], float]],
                      trial_count: int,
@@ -21,59 +26,82 @@ def label_bias_train(data_reader: DataReader,
     except FileNotFoundError:
         pass
     file_handler.prepare_model_directory(data_reader, tests)
-    print('\nTraining models...')
-    print('[', ' '*trial_count*len(tests), ']', sep='', end="\r", flush=True)
-    print('[', sep='', end='', flush=True)
-    pool: Pool = Pool(cpu_count)
-    result = pool.map_async(partial(__label_bias_trial, data_reader=data_reader, tests=tests, cpu_count=cpu_count), range(1, trial_count + 1))
-    result.wait()
-    pool.close()
-    pool.join()
-    num_failures = result.get()
-    print(f'] Failures: {sum(num_failures)}\n', flush=True)
-
-def __label_bias_trial(trial_num: int,
-                       data_reader: DataReader,
-                       tests: List[Tuple[Tuple[str, str, float, float], float]],
-                       cpu_count: int) -> int:
-    
-    initial_estimator = LogisticRegression(max_iter = const.MAX_ITER, n_jobs = const.N_JOBS)
+    initial_estimator = LogisticRegression(solver = const.SOLVER, max_iter = const.MAX_ITER, tol = const.TOLERANCE, n_jobs = const.N_JOBS)
     initial_data, initial_labels = data_reader.training_data()
     initial_estimator.fit(X = initial_data, y = initial_labels)
-    
-    pool: ThreadPool = ThreadPool(cpu_count)
-    async_result = pool.starmap_async(partial(__label_bias_fetch_train_constrain,
-                               data_reader=data_reader,
-                               initial_estimator=initial_estimator,
-                               training_sensitive_attributes=data_reader.training_sensitive_attributes(tests[0][0][0])),
-                       tests)
-    async_result.wait()
-    return_value = async_result.get()
-    trained_models, num_failures = zip(*return_value)
-    file_handler.save_models(data_reader, tests, trial_num, trained_models)
-    return sum(num_failures)
+    training_sensitive_attributes = data_reader.training_sensitive_attributes(tests[0][0][0]).to_numpy()
+    trial_results: Dict[int, Dict[int, Tuple[list, Tuple[str, str, float, float], float]]] = {trial_num: {} for trial_num in range(1, trial_count + 1)}
+    num_failures = 0
+    unbiased_test_indexes = {test_index for test_index, (flip_rate, _) in enumerate(tests) if flip_rate[2] == 0 and flip_rate[3] == 0}
+    label_bias_tasks = [(trial_num, test_index, flip_rate, confidence_threshold)
+                        for trial_num in range(1, trial_count + 1)
+                        for test_index, (flip_rate, confidence_threshold) in enumerate(tests)
+                        if trial_num == 1 or test_index not in unbiased_test_indexes]
+    chunksize = max(1, len(label_bias_tasks) // (4 * cpu_count))
+    print('\nTraining models...')
+    with Pool(cpu_count, initializer=__label_bias_worker_init, initargs=(data_reader, initial_estimator, training_sensitive_attributes)) as pool:
+        progress_bar = tqdm(pool.imap_unordered(__label_bias_task, label_bias_tasks, chunksize=chunksize), total=len(label_bias_tasks))
+        for trial_num, test_index, trained_models, failures in progress_bar:
+            num_failures += failures
+            progress_bar.set_postfix(failures=num_failures, refresh=False)
+            trained_models = dill.loads(trained_models)
+            for result_trial_num in (list(trial_results) if test_index in unbiased_test_indexes else [trial_num]):
+                trial_results[result_trial_num][test_index] = trained_models
+            for completed_trial_num in [result_trial_num for result_trial_num, results in trial_results.items() if len(results) == len(tests)]:
+                file_handler.save_models(data_reader, tests, completed_trial_num, [trial_results[completed_trial_num][i] for i in range(len(tests))])
+                del trial_results[completed_trial_num]
+    print(f'Failures: {num_failures}\n')
+
+def __label_bias_worker_init(data_reader: DataReader,
+                             initial_estimator: LogisticRegression,
+                             training_sensitive_attributes: np.ndarray):
+    threadpool_limits(limits = const.WORKER_THREADS)
+    __worker_state.update(data_reader=data_reader,
+                          initial_estimator=initial_estimator,
+                          training_sensitive_attributes=training_sensitive_attributes)
+
+def __label_bias_task(task: Tuple[int, int, Tuple[str, str, float, float], float]) -> Tuple[int, int, bytes, int]:
+    # Fitted mitigators can only be pickled by dill.
+    trial_num, test_index, flip_rate, confidence_threshold = task
+    trained_models, failures = __label_bias_fetch_train_constrain(flip_rate=flip_rate,
+                                                                  confidence_threshold=confidence_threshold,
+                                                                  **__worker_state)
+    return trial_num, test_index, dill.dumps(trained_models), failures
 
 def __label_bias_fetch_train_constrain(flip_rate: Tuple[str, str, float, float],
                                        confidence_threshold: float,
                                        data_reader: DataReader,
                                        initial_estimator: LogisticRegression,
-                                       training_sensitive_attributes: pd.DataFrame) -> Tuple[Tuple[list, Tuple[str, str, float, float], float], int]:
+                                       training_sensitive_attributes: np.ndarray) -> Tuple[Tuple[list, Tuple[str, str, float, float], float], int]:
     training_data, training_labels = data_reader.training_data_label_bias(flip_rate, confidence_threshold, initial_estimator)
-    for failures in range(const.TRIAL_MAX_ATTEMPTS):
+    try:
+        estimator = LogisticRegression(solver = const.SOLVER, max_iter = const.MAX_ITER, tol = const.TOLERANCE, n_jobs = const.N_JOBS)
+        estimator.fit(X = training_data, y = training_labels)
+        
+        trained_models = [estimator]
+        for model, _ in const.CONSTRAINED_MODELS.items():
+            trained_models.append(__fit_mitigator(model, estimator, training_data, training_labels, training_sensitive_attributes))
+        failures = 0
+    except (np.linalg.LinAlgError, ValueError):
+        trained_models = []
+        failures = 1
+    return (trained_models, flip_rate, confidence_threshold), failures
+
+def __fit_mitigator(model: type,
+                    estimator: LogisticRegression,
+                    training_data: pd.DataFrame,
+                    training_labels: pd.Series,
+                    training_sensitive_attributes: np.ndarray):
+    if model is DemographicParity and const.DIRECT_DEMOGRAPHIC_PARITY:
         try:
-            estimator = LogisticRegression(max_iter = const.MAX_ITER, n_jobs=const.N_JOBS)
-            estimator.fit(X = training_data, y = training_labels)
-            
-            trained_models = [estimator]
-            for model, _ in const.CONSTRAINED_MODELS.items():
-                constraint = model(difference_bound = const.DIFFERENCE_BOUND)
-                mitigator = ExponentiatedGradient(estimator = estimator, constraints = constraint)
-                mitigator.fit(X = training_data,
-                              y = training_labels,
-                              sensitive_features = training_sensitive_attributes)
-                trained_models.append(mitigator)
-        except:
-            continue
-        break
-    print('#' if failures < const.TRIAL_MAX_ATTEMPTS - 1 else 'X', end='', flush=True)
-    return (trained_models if failures < const.TRIAL_MAX_ATTEMPTS else [], flip_rate, confidence_threshold), failures
\ No newline at end of file
+            return DemographicParityClassifier(estimator = estimator, difference_bound = const.DIFFERENCE_BOUND).fit(X = training_data,
+                                                                                                                    y = training_labels,
+                                                                                                                    sensitive_features = training_sensitive_attributes)
+        except ValueError:
+            pass
+    constraint = model(difference_bound = const.DIFFERENCE_BOUND)
+    mitigator = ExponentiatedGradient(estimator = estimator, constraints = constraint)
+    mitigator.fit(X = training_data,
+                  y = training_labels,
+                  sensitive_features = training_sensitive_attributes)
+    return mitigator
@@ -9,4 +9,4 @@ def main(data_reader: DataReader):
 
 warnings.filterwarnings('ignore')
 if __name__ == '__main__':
-    main(Adult)
+    main(Adult())